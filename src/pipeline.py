@@ -10,15 +10,46 @@ from asr.whisper_infer import WhisperASR
 from pronunciation.pronunciation_metrics import analyze_pronunciation
 from utility.cmu_dict import transcript_to_phonemes
 from utility.mfa_wrapper import run_mfa_alignment
-import soundfile as sf
+from concurrent.futures import ProcessPoolExecutor
 import os
 import json
+import shutil
+import tempfile
+
+# Per-worker pipeline for evaluate_batch: each worker process builds its
+# pipeline (and loads its Whisper model) once, then reuses it for every
+# utterance it is handed.
+_worker_pipeline = None
+
+def _init_worker(asr_model_size):
+    global _worker_pipeline
+    _worker_pipeline = SpeakingEvaluatorPipeline(asr_model_size=asr_model_size)
+
+def _evaluate_in_worker(args):
+    audio_path, mfa_dict, mfa_model, mfa_output_dir = args
+    # Stage the wav into its own single-file corpus directory. evaluate()
+    # aligns the directory containing the audio, so without staging every
+    # worker would re-align the whole shared corpus concurrently (racing on
+    # MFA's per-corpus working directory) and then score whichever TextGrid
+    # happened to come first. The unique temp dir name also gives each MFA
+    # run its own working directory, and the alignment of a single file is
+    # kept to one MFA job to avoid oversubscribing the pool's CPUs.
+    corpus_dir = tempfile.mkdtemp(prefix="mfa_corpus_")
+    try:
+        staged_path = os.path.join(corpus_dir, os.path.basename(audio_path))
+        shutil.copy(audio_path, staged_path)
+        return _worker_pipeline.evaluate(
+            staged_path, mfa_dict, mfa_model, mfa_output_dir, mfa_num_jobs=1
+        )
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
 
 class SpeakingEvaluatorPipeline:
     def __init__(self, asr_model_size="base"):
+        self.asr_model_size = asr_model_size
         self.asr = WhisperASR(model_size=asr_model_size)
 
-    def evaluate(self, audio_path, mfa_dict, mfa_model, mfa_output_dir):
+    def evaluate(self, audio_path, mfa_dict, mfa_model, mfa_output_dir, mfa_num_jobs=None):
         # 1. ASR Transcription
         asr_result = self.asr.transcribe(audio_path)
         transcript = asr_result["transcript"]
@@ -33,7 +64,8 @@ class SpeakingEvaluatorPipeline:
 
         # 3. Run MFA alignment
         data_dir = os.path.dirname(audio_path)
-        textgrid_path = run_mfa_alignment(data_dir, mfa_dict, mfa_model, mfa_output_dir)
+        textgrid_path = run_mfa_alignment(data_dir, mfa_dict, mfa_model, mfa_output_dir,
+                                          num_jobs=mfa_num_jobs)
 
         # 4. Get pronunciation analysis results
         pronunciation_results = analyze_pronunciation(textgrid_path, expected_phonemes)
@@ -48,6 +80,27 @@ class SpeakingEvaluatorPipeline:
             "details": pronunciation_results
         }
 
+    def evaluate_batch(self, audio_paths, mfa_dict, mfa_model, mfa_output_dir, max_workers=None):
+        """
+        Evaluate several utterances in parallel worker processes.
+        Each utterance is staged into its own temporary single-file corpus
+        and aligned by a single-job MFA run writing to its own subdirectory
+        of mfa_output_dir, so the parallel alignments are fully isolated
+        from each other. Returns one evaluate() result dict per path, in
+        order.
+        """
+        jobs = []
+        for audio_path in audio_paths:
+            name = os.path.splitext(os.path.basename(audio_path))[0]
+            jobs.append((audio_path, mfa_dict, mfa_model, os.path.join(mfa_output_dir, name)))
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.asr_model_size,),
+        ) as executor:
+            return list(executor.map(_evaluate_in_worker, jobs))
+
     def save_results(self, results: dict, output_path: str):
         """Save evaluation results to a JSON file."""
         with open(output_path, 'w') as f:
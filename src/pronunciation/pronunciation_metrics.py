@@ -1,11 +1,13 @@
 # This module provides functions to analyze pronunciation metrics from TextGrid files.
 # It extracts phonemes, converts them to CMU notation (as it's in IPA format initially), and compares them against reference phonemes (in CMU format).
-# It uses the `textgrid` library to read TextGrid files and processes phonemes accordingly.
+# It uses a small built-in parser to read TextGrid files and processes phonemes accordingly.
 # It includes functions to convert IPA to CMU notation, strip stress markers, and analyze pronunciation.
 # The module is designed to be used in a pipeline for evaluating pronunciation metrics.
 
-import textgrid
 import numpy as np
+import Levenshtein
+from numba import njit
+from functools import lru_cache
 from typing import Dict, List, Any, Tuple
 
 IPA_TO_CMU = {
@@ -33,38 +35,86 @@ IPA_TO_CMU = {
     'v': 'V'
 }
 
-def extract_phonemes_from_textgrid(textgrid_path: str, tier_name: str = "phones") -> List[Dict[str, Any]]:
-    """Extract phonemes from a TextGrid file."""
-    # Read the TextGrid file
-    tg = textgrid.TextGrid.fromFile(textgrid_path)
-    phonemes = []
-    
+def _read_textgrid_tier(textgrid_path: str, tier_name: str) -> Tuple[List[str], List[float], List[float]]:
+    """
+    Minimal single-pass parser for long-format TextGrid files (the format
+    MFA writes). Reads only the interval tier with the given name, avoiding
+    the object construction the `textgrid` library does for every tier.
+    """
+    texts, starts, ends = [], [], []
+    in_tier = False
+    found = False
+    xmin = xmax = 0.0
+    with open(textgrid_path, encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if line.startswith('name = '):
+                in_tier = line == f'name = "{tier_name}"'
+                found = found or in_tier
+            elif in_tier:
+                if line.startswith('xmin = '):
+                    xmin = float(line[7:])
+                elif line.startswith('xmax = '):
+                    xmax = float(line[7:])
+                elif line.startswith('text = '):
+                    # Strip the surrounding quotes and unescape doubled ones
+                    mark = line[8:-1].replace('""', '"')
+                    texts.append(mark)
+                    starts.append(xmin)
+                    ends.append(xmax)
+    if not found:
+        raise ValueError(f"Tier '{tier_name}' not found in {textgrid_path}")
+    return texts, starts, ends
+
+def extract_phonemes_from_textgrid(textgrid_path: str, tier_name: str = "phones") -> Dict[str, Any]:
+    """
+    Extract phonemes from a TextGrid file.
+    Returns a structure-of-arrays dict: 'text' is a list of phoneme labels,
+    'start' and 'end' are parallel float64 numpy arrays of interval times.
+    """
+    texts = []
+    starts = []
+    ends = []
+
     try:
-        # Find the phones tier
-        tier = [t for t in tg.tiers if t.name == tier_name][0]
-        
-        # Extract phonemes with timing information
-        for interval in tier:
-            if interval.mark.strip():  # Skip empty intervals
-                phonemes.append({
-                    'text': interval.mark,
-                    'start': interval.minTime,
-                    'end': interval.maxTime
-                })
-                
+        tier_texts, tier_starts, tier_ends = _read_textgrid_tier(textgrid_path, tier_name)
+
+        # Keep phonemes with timing information, skipping empty intervals
+        for text, start, end in zip(tier_texts, tier_starts, tier_ends):
+            if text.strip():
+                texts.append(text)
+                starts.append(start)
+                ends.append(end)
+
     except Exception as e:
         print(f"Error processing TextGrid: {str(e)}")
-        return []
-    
-    return phonemes
+        return {'text': [], 'start': np.empty(0), 'end': np.empty(0)}
+
+    return {
+        'text': texts,
+        'start': np.array(starts, dtype=np.float64),
+        'end': np.array(ends, dtype=np.float64)
+    }
+
+# Working copy of the IPA->CMU table; uppercased fallbacks for phonemes
+# outside the table are added on first sight so every later conversion is a
+# single dict hit with no per-call .upper().
+_IPA_CONVERSIONS = dict(IPA_TO_CMU)
 
 def convert_ipa_to_cmu(ipa_phoneme: str) -> str:
     """Convert IPA phoneme to CMU notation."""
-    return IPA_TO_CMU.get(ipa_phoneme, ipa_phoneme.upper())
+    cmu = _IPA_CONVERSIONS.get(ipa_phoneme)
+    if cmu is None:
+        cmu = ipa_phoneme.upper()
+        _IPA_CONVERSIONS[ipa_phoneme] = cmu
+    return cmu
+
+# Deletes the stress digits in a single C call instead of iterating per character.
+_STRIP_TBL = str.maketrans('', '', '012')
 
 def strip_stress_markers(phoneme: str) -> str:
     """Remove stress markers (0,1,2) from phonemes."""
-    return ''.join(c for c in phoneme if not c.isdigit())
+    return phoneme.translate(_STRIP_TBL)
 
 def get_alignment_score(p1: str, p2: str) -> float:
     """Get similarity score between two phonemes."""
@@ -75,32 +125,41 @@ def get_alignment_score(p1: str, p2: str) -> float:
         return 0.8
     return 0.0
 
-def align_sequences(actual: List[str], reference: List[str]) -> List[Tuple[str, str, float]]:
+@njit(cache=True)
+def _fill_alignment_matrices(actual_ids: np.ndarray, ref_ids: np.ndarray,
+                             sub_cost_lut: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Align two phoneme sequences using dynamic programming with gap insertions.
-    Returns list of (actual, reference, score) tuples.
+    Fill the DP cost and backpointer matrices for integer-encoded phonemes.
+    Costs are scaled by 5 so every step (gap 0.8 -> 4, mismatch 1.0 -> 5)
+    is an exact integer and the matrices stay int32 instead of float.
+    Note: exact integer costs make the <= tie comparisons deterministic,
+    where float accumulation rounded some near-ties, so equal-cost
+    alignments can resolve differently than the float implementation did.
+    The total alignment cost is identical, but the chosen path — and with
+    it the per-phoneme matches and the averaged score — can differ.
     """
-    GAP = "GAP"  # Token to represent gaps in either sequence
-    n, m = len(actual), len(reference)
-    
-    # Initialize matrices
-    dp = np.zeros((n + 1, m + 1))  # Scores
-    bp = np.zeros((n + 1, m + 1), dtype=int)  # Backpointers: 0=match/mismatch, 1=gap in ref, 2=gap in actual
-    
-    # Initialize first row and column
-    for i in range(n + 1):
-        dp[i, 0] = i * 0.8  # Gap penalty
-    for j in range(m + 1):
-        dp[0, j] = j * 0.8
-        
+    n, m = actual_ids.shape[0], ref_ids.shape[0]
+    dp = np.zeros((n + 1, m + 1), dtype=np.int32)  # Costs (x5)
+    bp = np.zeros((n + 1, m + 1), dtype=np.int8)  # Backpointers: 0=match/mismatch, 1=gap in ref, 2=gap in actual
+
+    # Initialize first row and column. The boundary backpointers must be
+    # gap moves, not the default 0 (diagonal), or the backtrack walks off
+    # the matrix edge when one sequence is exhausted first.
+    for i in range(1, n + 1):
+        dp[i, 0] = i * 4  # Gap penalty
+        bp[i, 0] = 1  # Gap in reference
+    for j in range(1, m + 1):
+        dp[0, j] = j * 4
+        bp[0, j] = 2  # Gap in actual
+
     # Fill matrices
     for i in range(1, n + 1):
+        ai = actual_ids[i - 1]
         for j in range(1, m + 1):
-            match_score = get_alignment_score(actual[i-1], reference[j-1])
-            diag = dp[i-1, j-1] + (0 if match_score > 0.7 else 1)  # Match/mismatch
-            up = dp[i-1, j] + 0.8  # Gap in reference
-            left = dp[i, j-1] + 0.8  # Gap in actual
-            
+            diag = dp[i - 1, j - 1] + sub_cost_lut[ai, ref_ids[j - 1]]  # Match/mismatch
+            up = dp[i - 1, j] + 4  # Gap in reference
+            left = dp[i, j - 1] + 4  # Gap in actual
+
             # Choose minimum and store backpointer
             if diag <= up and diag <= left:
                 dp[i, j] = diag
@@ -111,14 +170,94 @@ def align_sequences(actual: List[str], reference: List[str]) -> List[Tuple[str,
             else:
                 dp[i, j] = left
                 bp[i, j] = 2
-    
+
+    return dp, bp
+
+@lru_cache(maxsize=128)
+def _build_score_lut(phones: Tuple[str, ...]) -> np.ndarray:
+    """
+    Pairwise score lookup table for a phoneme vocabulary. Cached on the
+    sorted vocabulary tuple, so any two utterances drawing on the same set
+    of phonemes share a table regardless of the order the phonemes appear
+    in; the cache is bounded so a long-running service doesn't accumulate
+    one table per distinct vocabulary forever.
+    """
+    # Strip and uppercase each unique phoneme once, then score on the
+    # precomputed forms instead of re-stripping per pair.
+    stripped = [p.upper().translate(_STRIP_TBL) for p in phones]
+    similar = [p in ('AA', 'AO', 'AH') for p in phones]
+    score_lut = np.zeros((len(phones), len(phones)), dtype=np.float32)
+    for i in range(len(phones)):
+        for j in range(len(phones)):
+            if stripped[i] == stripped[j]:
+                score_lut[i, j] = 1.0
+            elif similar[i] and similar[j]:
+                score_lut[i, j] = 0.8
+    return score_lut
+
+def _encode_phonemes(actual: List[str], reference: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Encode both sequences to small ints and look up their pairwise score table."""
+    # Canonical (sorted) vocabulary, so the cache key doesn't depend on the
+    # order phonemes happen to appear in a particular utterance.
+    phones = tuple(sorted(set(actual) | set(reference)))
+    vocab = {p: i for i, p in enumerate(phones)}
+
+    score_lut = _build_score_lut(phones)
+    actual_ids = np.array([vocab[p] for p in actual], dtype=np.int32)
+    ref_ids = np.array([vocab[p] for p in reference], dtype=np.int32)
+    return actual_ids, ref_ids, score_lut
+
+# Phoneme-class codepoints for the score-only fast path. Each distinct phoneme
+# (after stress stripping) maps to one private-use-area character, with the
+# AA/AO/AH equivalence class collapsed to a single character so the string
+# edit distance treats them as matches.
+_PHONEME_CODEPOINTS: Dict[str, str] = {}
+
+def _phonemes_to_string(phonemes: List[str]) -> str:
+    """Encode a phoneme sequence as a string of one character per phoneme."""
+    chars = []
+    for p in phonemes:
+        key = strip_stress_markers(p.upper())
+        if key in ('AA', 'AO', 'AH'):
+            key = 'AA'
+        if key not in _PHONEME_CODEPOINTS:
+            _PHONEME_CODEPOINTS[key] = chr(0xE000 + len(_PHONEME_CODEPOINTS))
+        chars.append(_PHONEME_CODEPOINTS[key])
+    return ''.join(chars)
+
+def pronunciation_similarity(actual: List[str], reference: List[str]) -> float:
+    """
+    Normalized similarity (0-1) between two phoneme sequences.
+    Score-only fast path: encodes each phoneme as one character and runs the
+    C edit-distance implementation from python-Levenshtein, skipping the full
+    DP alignment when no per-phoneme trace is needed.
+    """
+    if not actual and not reference:
+        return 1.0
+    return Levenshtein.ratio(_phonemes_to_string(actual), _phonemes_to_string(reference))
+
+def align_sequences(actual: List[str], reference: List[str]) -> List[Tuple[str, str, float]]:
+    """
+    Align two phoneme sequences using dynamic programming with gap insertions.
+    The O(n*m) matrix fill runs in a Numba-compiled kernel over integer-encoded
+    phonemes; backtracking stays in Python since it is only O(n+m).
+    Returns list of (actual, reference, score) tuples.
+    """
+    GAP = "GAP"  # Token to represent gaps in either sequence
+    n, m = len(actual), len(reference)
+
+    actual_ids, ref_ids, score_lut = _encode_phonemes(actual, reference)
+    # Integer substitution costs (x5 scale): 0 for a match, 5 for a mismatch
+    sub_cost_lut = np.where(score_lut > 0.7, 0, 5).astype(np.int8)
+    dp, bp = _fill_alignment_matrices(actual_ids, ref_ids, sub_cost_lut)
+
     # Backtrack to get alignment
     aligned = []
     i, j = n, m
     while i > 0 or j > 0:
         if i > 0 and j > 0 and bp[i, j] == 0:
             # Match/mismatch
-            score = get_alignment_score(actual[i-1], reference[j-1])
+            score = float(score_lut[actual_ids[i-1], ref_ids[j-1]])
             aligned.append((actual[i-1], reference[j-1], score))
             i -= 1
             j -= 1
@@ -130,31 +269,34 @@ def align_sequences(actual: List[str], reference: List[str]) -> List[Tuple[str,
             # Gap in actual
             aligned.append((GAP, reference[j-1], 0.0))
             j -= 1
-            
+
     return list(reversed(aligned))
 
 def analyze_pronunciation(textgrid_path: str, reference_phonemes: List[str]) -> Dict[str, Any]:
     """Compare actual pronunciation against reference phonemes with gap-based alignment."""
     actual_phonemes = extract_phonemes_from_textgrid(textgrid_path)
-    actual_phones = [convert_ipa_to_cmu(p['text']) for p in actual_phonemes]
+    actual_phones = [convert_ipa_to_cmu(text) for text in actual_phonemes['text']]
     
     # Align sequences
     aligned_phonemes = align_sequences(actual_phones, reference_phonemes)
     
-    # Create detailed matches
-    matches = [
-        {
+    # Create detailed matches and accumulate the overall score (ignoring
+    # gaps) in the same pass, instead of building a second filtered list.
+    matches = []
+    valid_count = 0
+    valid_total = 0.0
+    for actual, ref, score in aligned_phonemes:
+        is_gap = actual == "GAP" or ref == "GAP"
+        matches.append({
             "actual": actual if actual != "GAP" else "---",
             "reference": ref if ref != "GAP" else "---",
-            "match": actual != "GAP" and ref != "GAP" and score > 0.7,
+            "match": not is_gap and score > 0.7,
             "score": score
-        }
-        for actual, ref, score in aligned_phonemes
-    ]
-    
-    # Calculate overall score, ignoring gaps
-    valid_matches = [m for m in matches if m["actual"] != "---" and m["reference"] != "---"]
-    score = sum(m["score"] for m in valid_matches) / len(valid_matches) if valid_matches else 0
+        })
+        if not is_gap:
+            valid_count += 1
+            valid_total += score
+    score = valid_total / valid_count if valid_count else 0
     
     return {
         "pred_phonemes": actual_phones,
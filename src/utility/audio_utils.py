@@ -0,0 +1,27 @@
+import wave
+import numpy as np
+
+def load_wav_16k_mono(audio_path):
+    """
+    Load a 16 kHz mono 16-bit WAV file straight into a float32 array,
+    skipping the general decode/resample path. Returns None if the file
+    is not a WAV in that exact format, so callers can fall back.
+    """
+    try:
+        with wave.open(audio_path, "rb") as wav:
+            if (wav.getframerate() != 16000
+                    or wav.getnchannels() != 1
+                    or wav.getsampwidth() != 2):
+                return None
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+def get_wav_duration(audio_path):
+    """
+    Duration of a WAV file in seconds, read from the header only
+    (no audio decoding).
+    """
+    with wave.open(audio_path, "rb") as wav:
+        return wav.getnframes() / wav.getframerate()
@@ -1,9 +1,23 @@
 import nltk
-nltk.download('cmudict')
-from nltk.corpus import cmudict
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def _load_cmu_dict():
+    """
+    Load the CMU dictionary once per process, on first use.
+    Nothing runs at import time, so importing this module (directly or via
+    the pipeline) costs nothing; the corpus is only downloaded if it is
+    actually missing from disk.
+    """
+    try:
+        nltk.data.find('corpora/cmudict')
+    except LookupError:
+        nltk.download('cmudict')
+    from nltk.corpus import cmudict
+    return cmudict.dict()
 
 def transcript_to_phonemes(transcript):
-    cmu = cmudict.dict()
+    cmu = _load_cmu_dict()
     words = transcript.lower().split()
     phonemes = []
     for word in words:
@@ -14,4 +28,4 @@ def transcript_to_phonemes(transcript):
             phonemes.extend(cmu[word_clean][0])
         else:
             phonemes.append('UNK')
-    return phonemes
\ No newline at end of file
+    return phonemes
@@ -9,31 +9,54 @@
 import subprocess
 import os
 import shutil
+from collections import deque
 
 def is_mfa_installed():
     """Check if MFA is installed and available in PATH."""
     return shutil.which("mfa") is not None
 
-def run_mfa_alignment(data_dir, dict_path, model_path, output_dir):
+def run_mfa_alignment(data_dir, dict_path, model_path, output_dir, num_jobs=None, log_path=None):
     """
     Run Montreal Forced Aligner (MFA) via subprocess.
+    num_jobs controls how many worker processes MFA splits the corpus
+    across; defaults to the machine's CPU count. MFA's log is discarded
+    unless log_path names a file to write it to; the last lines are kept
+    either way for the error message on failure.
     """
     if not is_mfa_installed():
         raise EnvironmentError(
             "Montreal Forced Aligner (MFA) is not installed or not in your PATH. "
             "Please activate your conda environment with MFA installed."
         )
+    if num_jobs is None:
+        num_jobs = os.cpu_count() or 1
     cmd = [
         "mfa", "align",
         data_dir,
         dict_path,
         model_path,
         output_dir,
-        "--clean"
+        "--clean",
+        "--num_jobs", str(num_jobs)
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"MFA failed: {result.stderr}")
+    # Consume MFA's output as it is produced instead of buffering the whole
+    # run in memory; keep only the last lines for the error message.
+    process = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    tail = deque(maxlen=50)
+    log_file = open(log_path, "w") if log_path else None
+    try:
+        for line in process.stdout:
+            tail.append(line)
+            if log_file:
+                log_file.write(line)
+        process.wait()
+    finally:
+        if log_file:
+            log_file.close()
+    if process.returncode != 0:
+        raise RuntimeError(f"MFA failed: {''.join(tail)}")
     # Return the path to the first TextGrid file in output_dir
     textgrids = [f for f in os.listdir(output_dir) if f.endswith(".TextGrid")]
     if not textgrids: